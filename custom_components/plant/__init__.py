@@ -31,6 +31,7 @@ from homeassistant.helpers import (
     device_registry as dr,
     entity_registry as er,
 )
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.entity import Entity, async_generate_entity_id
 from homeassistant.helpers.entity_component import EntityComponent
 
@@ -52,6 +53,7 @@ from .const import (
     ATTR_TEMPERATURE,
     ATTR_THRESHOLDS,
     DATA_SOURCE,
+    DATA_UPDATED,
     DOMAIN,
     DOMAIN_PLANTBOOK,
     FLOW_CONDUCTIVITY_TRIGGER,
@@ -791,3 +793,5 @@ class PlantDevice(Entity):
 
     async def async_added_to_hass(self) -> None:
         self.update_registry()
+        # Let the meters of this plant refresh now that the device is registered
+        async_dispatcher_send(self._hass, f"{DATA_UPDATED}_{self.unique_id}")
@@ -2,10 +2,10 @@
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+from array import array
 import logging
 
-from homeassistant.components.integration.const import METHOD_TRAPEZOIDAL
+from homeassistant.components.integration.const import METHOD_LEFT
 from homeassistant.components.integration.sensor import IntegrationSensor
 from homeassistant.components.sensor import (
     RestoreSensor,
@@ -28,7 +28,12 @@ from homeassistant.const import (
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import Entity, async_generate_entity_id
-from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_point_in_utc_time,
+    async_track_state_change_event,
+)
+from homeassistant.util import dt as dt_util
 
 from .const import (
     ATTR_CONDUCTIVITY,
@@ -54,6 +59,27 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# lx -> μmol/m²/s, folded into a single factor
+_PPFD_SCALE = DEFAULT_LUX_TO_PPFD / 1_000_000.0
+_BAD_STATES = frozenset({None, STATE_UNAVAILABLE, STATE_UNKNOWN})
+# Shared by all meters without an external sensor. Never modify it.
+_EMPTY_ATTRS: dict = {}
+
+# The DLI sliding window is kept as 288 buckets of 5 minutes each
+_DLI_SLOT_SECONDS = 5 * 60
+_DLI_WINDOW_SLOTS = 24 * 60 * 60 // _DLI_SLOT_SECONDS
+# Write the DLI state at most this often (seconds)
+_DLI_WRITE_INTERVAL = 0.5
+# Source changes are added to the window after this many changes
+# or this many seconds, whichever comes first
+_DLI_DEBOUNCE_COUNT = 3
+_DLI_DEBOUNCE_SECONDS = 10
+
+
+def _looks_numeric(value: str | None) -> bool:
+    """Cheap check that a state string can be a number, before calling float()"""
+    return bool(value) and value[0] in "0123456789-+."
+
 
 class PlantCurrentStatus(RestoreSensor):
     """Parent class for the meter classes below"""
@@ -66,12 +92,13 @@ class PlantCurrentStatus(RestoreSensor):
         self._config = config
         self._default_state = 0
         self._plant = plantdevice
+        self._tracker = []
+        self._unsub_tracker = None
         # self._conf_check_days = self._plant.check_days
         self.entity_id = async_generate_entity_id(
             f"{DOMAIN}.{{}}", self.name, current_ids={}
         )
-        if not self._attr_native_value or self._attr_native_value == STATE_UNKNOWN:
-            self._attr_native_value = self._default_state
+        self._attr_native_value = self._default_state
 
     @property
     def state_class(self):
@@ -80,12 +107,8 @@ class PlantCurrentStatus(RestoreSensor):
     @property
     def extra_state_attributes(self) -> dict:
         if self._external_sensor:
-            attributes = {
-                "external_sensor": self.external_sensor,
-                # "history_max": self._history.max,
-                # "history_min": self._history.min,
-            }
-            return attributes
+            return {"external_sensor": self._external_sensor}
+        return _EMPTY_ATTRS
 
     @property
     def external_sensor(self) -> str:
@@ -97,13 +120,26 @@ class PlantCurrentStatus(RestoreSensor):
         _LOGGER.info("Setting %s external sensor to %s", self.entity_id, new_sensor)
         # pylint: disable=attribute-defined-outside-init
         self._external_sensor = new_sensor
-        async_track_state_change_event(
+        self.async_track_entities()
+
+        self.async_write_ha_state()
+
+    def async_track_entities(self) -> None:
+        """Track state_changed of ourself and the external sensor"""
+        tracker = [self.entity_id]
+        if self._external_sensor:
+            tracker.append(self._external_sensor)
+        if tracker == self._tracker:
+            return
+        # Drop the listener for the previous sensor before adding a new one
+        if self._unsub_tracker:
+            self._unsub_tracker()
+        self._unsub_tracker = async_track_state_change_event(
             self._hass,
-            list([self.entity_id, self._external_sensor]),
+            tracker,
             self._state_changed_event,
         )
-
-        self.async_write_ha_state()
+        self._tracker = tracker
 
     async def async_added_to_hass(self) -> None:
         """Handle entity which will be added."""
@@ -114,19 +150,27 @@ class PlantCurrentStatus(RestoreSensor):
         self._attr_native_value = STATE_UNKNOWN
         if state:
             if "external_sensor" in state.attributes:
-                self.replace_external_sensor(state.attributes["external_sensor"])
-        tracker = [self.entity_id]
-        if self._external_sensor:
-            tracker.append(self._external_sensor)
-        async_track_state_change_event(
-            self._hass,
-            tracker,
-            self._state_changed_event,
-        )
-        async_dispatcher_connect(
-            self._hass, DATA_UPDATED, self._schedule_immediate_update
+                self._external_sensor = state.attributes["external_sensor"]
+        # Register the state tracker once, it is replaced if the sensor changes
+        self.async_track_entities()
+        self.async_on_remove(self.async_untrack_entities)
+        # Only listen for updates of our own plant
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self._hass,
+                f"{DATA_UPDATED}_{self._plant.unique_id}",
+                self._schedule_immediate_update,
+            )
         )
 
+    @callback
+    def async_untrack_entities(self) -> None:
+        """Stop tracking state changes"""
+        if self._unsub_tracker:
+            self._unsub_tracker()
+            self._unsub_tracker = None
+        self._tracker = []
+
     @callback
     def _schedule_immediate_update(self):
         self.async_schedule_update_ha_state(True)
@@ -139,18 +183,24 @@ class PlantCurrentStatus(RestoreSensor):
     @callback
     def state_changed(self, entity_id, new_state):
         """Run on every update to allow for changes from the GUI and service call"""
-        if not self.hass.states.get(self.entity_id):
+        state_obj = self.hass.states.get(self.entity_id)
+        if state_obj is None:
             return
-        current_attrs = self.hass.states.get(self.entity_id).attributes
+        current_attrs = state_obj.attributes
         if current_attrs.get("external_sensor") != self._external_sensor:
             self.replace_external_sensor(current_attrs.get("external_sensor"))
         if self._external_sensor:
             external_sensor = self.hass.states.get(self._external_sensor)
             if external_sensor:
+                unit = external_sensor.attributes[ATTR_UNIT_OF_MEASUREMENT]
+                # Leave the cached properties alone if nothing changed
+                if (
+                    external_sensor.state == self._attr_native_value
+                    and unit == self._attr_native_unit_of_measurement
+                ):
+                    return
                 self._attr_native_value = external_sensor.state
-                self._attr_native_unit_of_measurement = external_sensor.attributes[
-                    ATTR_UNIT_OF_MEASUREMENT
-                ]
+                self._attr_native_unit_of_measurement = unit
             else:
                 self._attr_native_value = STATE_UNKNOWN
         else:
@@ -314,10 +364,7 @@ class PlantCurrentPpfd(PlantCurrentStatus):
         https://www.apogeeinstruments.com/conversion-ppfd-to-lux/
         μmol/m²/s
         """
-        if value is not None and value != STATE_UNAVAILABLE and value != STATE_UNKNOWN:
-            value = float(value) * DEFAULT_LUX_TO_PPFD / 1000000
-
-        return value
+        return value if value in _BAD_STATES else float(value) * _PPFD_SCALE
 
     @callback
     def state_changed(self, entity_id: str, new_state: str) -> None:
@@ -347,7 +394,7 @@ class PlantTotalLightIntegral(IntegrationSensor):
     ) -> None:
         """Initialize the sensor"""
         super().__init__(
-            integration_method=METHOD_TRAPEZOIDAL,
+            integration_method=METHOD_LEFT,
             name=f"{config.data[FLOW_PLANT_INFO][ATTR_NAME]} Total {READING_PPFD} Integral",
             round_digits=2,
             source_entity=illuminance_ppfd_sensor.entity_id,
@@ -387,8 +434,18 @@ class PlantDailyLightIntegral(SensorEntity):
         self._attr_icon = "mdi:white-balance-sunny"
         self._attr_state_class = SensorStateClass.MEASUREMENT
         
-        # Store the last 24 hours of data points (timestamp, value)
-        self._data_points = []
+        # Store the last 24 hours of increments in a ring of 5 minute buckets
+        # and keep a running sum so we never have to re-add the window
+        self._buckets = array("d", [0.0] * _DLI_WINDOW_SLOTS)
+        self._bucket_total = 0.0
+        self._last_slot = None
+        self._unsub_expiry = None
+        self._unsub_write = None
+        self._pending_write = False
+        self._unsub_debounce = None
+        self._debounce_count = 0
+        self._pending_increment = 0.0
+        self._pending_timestamp = None
         self._last_value = 0
         self._attr_native_value = 0
 
@@ -412,67 +469,166 @@ class PlantDailyLightIntegral(SensorEntity):
                 self._attr_native_value = 0
                 
         # Track the source entity
-        async_track_state_change_event(
-            self._hass,
-            [self._source_entity],
-            self._source_changed,
-        )
-        
-        # Schedule regular updates to maintain the sliding window
-        from homeassistant.helpers.event import async_track_time_interval
         self.async_on_remove(
-            async_track_time_interval(
+            async_track_state_change_event(
                 self._hass,
-                self._update_sliding_window,
-                timedelta(minutes=5)  # Update every 5 minutes
+                [self._source_entity],
+                self._source_changed,
             )
         )
         
+        # The expiry timer is armed when the first increment arrives
+        self.async_on_remove(self._cancel_expiry)
+        self.async_on_remove(self._cancel_write)
+        self.async_on_remove(self._cancel_debounce)
+        
     @callback
     def _source_changed(self, event):
         """Handle source entity state changes."""
-        if not event.data.get("new_state"):
+        data = event.data
+        new_state = data.get("new_state")
+        if new_state is None or not _looks_numeric(new_state.state):
             return
-            
+
+        # Still guard float() against odd strings that pass the quick check
         try:
-            new_value = float(event.data["new_state"].state)
-            old_value = 0
-            if event.data.get("old_state") and event.data["old_state"].state not in (STATE_UNKNOWN, STATE_UNAVAILABLE):
-                try:
-                    old_value = float(event.data["old_state"].state)
-                except (ValueError, TypeError):
-                    pass
-                    
-            # Calculate the increment since last update
-            increment = new_value - old_value
-            if increment > 0:
-                now = datetime.now()
-                self._data_points.append((now, increment))
-                self._update_value()
-                
+            new_value = float(new_state.state)
         except (ValueError, TypeError):
-            pass
-            
+            return
+
+        old_value = 0
+        old_state = data.get("old_state")
+        if old_state is not None and _looks_numeric(old_state.state):
+            try:
+                old_value = float(old_state.state)
+            except (ValueError, TypeError):
+                pass
+
+        # Calculate the increment since last update
+        increment = new_value - old_value
+        if increment > 0:
+            self._pending_increment += increment
+            # The event is already stamped by the bus. Use the raw unix
+            # timestamp, time_fired would build a datetime from it.
+            self._pending_timestamp = event.time_fired_timestamp
+            self._debounce_count += 1
+            if self._debounce_count >= _DLI_DEBOUNCE_COUNT:
+                self._flush_increment()
+            elif self._unsub_debounce is None:
+                self._unsub_debounce = async_call_later(
+                    self._hass, _DLI_DEBOUNCE_SECONDS, self._flush_increment
+                )
+
+    @callback
+    def _flush_increment(self, _now=None) -> None:
+        """Add the increments collected by the debouncer to the window."""
+        if self._unsub_debounce:
+            self._unsub_debounce()
+            self._unsub_debounce = None
+        self._debounce_count = 0
+        if not self._pending_increment:
+            return
+
+        self._advance_window(self._pending_timestamp)
+        self._buckets[self._last_slot % _DLI_WINDOW_SLOTS] += self._pending_increment
+        self._bucket_total += self._pending_increment
+        self._pending_increment = 0.0
+        if self._unsub_expiry is None:
+            self._schedule_expiry()
+        self._update_value()
+
+    @callback
+    def _cancel_debounce(self) -> None:
+        """Cancel the pending debounce timer and drop what it collected."""
+        if self._unsub_debounce:
+            self._unsub_debounce()
+            self._unsub_debounce = None
+        self._debounce_count = 0
+        self._pending_increment = 0.0
+
+    def _advance_window(self, timestamp: float) -> None:
+        """Move the window forward to a unix timestamp, emptying expired buckets."""
+        slot = int(timestamp) // _DLI_SLOT_SECONDS
+        if self._last_slot is None:
+            self._last_slot = slot
+            return
+        if slot <= self._last_slot:
+            return
+        if slot - self._last_slot >= _DLI_WINDOW_SLOTS:
+            # Nothing in the window is recent enough to keep
+            self._buckets = array("d", [0.0] * _DLI_WINDOW_SLOTS)
+            self._bucket_total = 0.0
+        else:
+            for expired in range(self._last_slot + 1, slot + 1):
+                idx = expired % _DLI_WINDOW_SLOTS
+                self._bucket_total -= self._buckets[idx]
+                self._buckets[idx] = 0.0
+        self._last_slot = slot
+
+    def _schedule_expiry(self) -> None:
+        """Arm a timer for when the oldest non-empty bucket leaves the window."""
+        first_slot = self._last_slot - _DLI_WINDOW_SLOTS + 1
+        for slot in range(first_slot, self._last_slot + 1):
+            if self._buckets[slot % _DLI_WINDOW_SLOTS]:
+                self._unsub_expiry = async_track_point_in_utc_time(
+                    self._hass,
+                    self._update_sliding_window,
+                    dt_util.utc_from_timestamp(
+                        (slot + _DLI_WINDOW_SLOTS) * _DLI_SLOT_SECONDS
+                    ),
+                )
+                return
+        # The window is empty, drop any float drift and wait for the next increment
+        self._bucket_total = 0.0
+
+    @callback
+    def _cancel_expiry(self) -> None:
+        """Cancel the pending expiry timer."""
+        if self._unsub_expiry:
+            self._unsub_expiry()
+            self._unsub_expiry = None
+
     @callback
     def _update_sliding_window(self, _now=None):
-        """Update the sliding window by removing data points older than 24 hours."""
-        if not self._data_points:
+        """Update the sliding window by removing increments older than 24 hours."""
+        self._unsub_expiry = None
+        if self._last_slot is None:
             return
-            
-        now = datetime.now()
-        cutoff = now - timedelta(hours=24)
-        
-        # Remove data points older than 24 hours
-        self._data_points = [dp for dp in self._data_points if dp[0] >= cutoff]
+
+        self._advance_window(dt_util.utcnow().timestamp())
+        self._schedule_expiry()
         self._update_value()
-        
+
     def _update_value(self):
-        """Update the sensor value based on the current data points."""
-        if not self._data_points:
-            self._attr_native_value = 0
-        else:
-            # Sum all increments in the sliding window
-            total = sum(value for _, value in self._data_points)
-            self._attr_native_value = round(total, 2)
-            
+        """Update the sensor value based on the current buckets."""
+        # Clamp to avoid reporting float drift below zero for an empty window
+        self._attr_native_value = round(max(self._bucket_total, 0.0), 2)
+
+        # Bursts of updates are coalesced into one write per interval
+        if self._unsub_write is not None:
+            self._pending_write = True
+            return
+        self._write_state()
+
+    def _write_state(self) -> None:
+        """Write the state and hold back further writes for a short while."""
         self.async_write_ha_state()
+        self._unsub_write = async_call_later(
+            self._hass, _DLI_WRITE_INTERVAL, self._flush_write
+        )
+
+    @callback
+    def _flush_write(self, _now=None) -> None:
+        """Write the value that was held back during the last interval."""
+        self._unsub_write = None
+        if self._pending_write:
+            self._pending_write = False
+            self._write_state()
+
+    @callback
+    def _cancel_write(self) -> None:
+        """Cancel the pending write timer."""
+        if self._unsub_write:
+            self._unsub_write()
+            self._unsub_write = None
+        self._pending_write = False
@@ -3,10 +3,11 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta
+from functools import lru_cache
 import logging
 import random
 
-from homeassistant.components.integration.const import METHOD_TRAPEZOIDAL
+from homeassistant.components.integration.const import METHOD_LEFT
 from homeassistant.components.integration.sensor import IntegrationSensor
 from homeassistant.components.sensor import (
     RestoreSensor,
@@ -78,6 +79,18 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# lx -> μmol/m²/s, folded into a single factor
+_PPFD_SCALE = DEFAULT_LUX_TO_PPFD / 1_000_000.0
+_BAD_STATES = frozenset({None, STATE_UNAVAILABLE, STATE_UNKNOWN})
+# Shared by all meters without an external sensor. Never modify it.
+_EMPTY_ATTRS: dict = {}
+
+
+@lru_cache(maxsize=256)
+def _parse_float(value: str) -> float:
+    """Parse a state string, shared by all meters reading the same sensor"""
+    return float(value)
+
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
@@ -148,9 +161,31 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+def _build_names(config: ConfigEntry, reading: str, key: str) -> tuple[str, str]:
+    """Return the entity name and unique id for a meter of a plant"""
+    return (
+        f"{config.data[FLOW_PLANT_INFO][ATTR_NAME]} {reading}",
+        f"{config.entry_id}-{key}",
+    )
+
+
 class PlantCurrentStatus(RestoreSensor):
     """Parent class for the meter classes below"""
 
+    # The HA base classes still give every entity a __dict__, so this only
+    # moves our own fixed attributes into slots.
+    __slots__ = (
+        "_hass",
+        "_config",
+        "_plant",
+        "_external_sensor",
+        "_default_state",
+        "_follow_external",
+        "_tracker",
+        "_unsub_tracker",
+        "_write_scheduled",
+    )
+
     def __init__(
         self, hass: HomeAssistant, config: ConfigEntry, plantdevice: Entity
     ) -> None:
@@ -160,22 +195,14 @@ class PlantCurrentStatus(RestoreSensor):
         self._default_state = None
         self._plant = plantdevice
         self._tracker = []
+        self._unsub_tracker = None
+        self._write_scheduled = False
         self._follow_external = True
         # self._conf_check_days = self._plant.check_days
         self.entity_id = async_generate_entity_id(
-            f"{DOMAIN}.{{}}", self.name, current_ids={}
+            f"{DOMAIN}.{{}}", self._attr_name, current_ids={}
         )
-        if (
-            not self._attr_native_value
-            or self._attr_native_value == STATE_UNKNOWN
-            or self._attr_native_value == STATE_UNAVAILABLE
-        ):
-            _LOGGER.debug(
-                "Unknown native value for %s, setting to default: %s",
-                self.entity_id,
-                self._default_state,
-            )
-            self._attr_native_value = self._default_state
+        self._attr_native_value = self._default_state
 
     @property
     def state_class(self):
@@ -191,12 +218,8 @@ class PlantCurrentStatus(RestoreSensor):
     @property
     def extra_state_attributes(self) -> dict:
         if self._external_sensor:
-            attributes = {
-                "external_sensor": self.external_sensor,
-                # "history_max": self._history.max,
-                # "history_min": self._history.min,
-            }
-            return attributes
+            return {"external_sensor": self._external_sensor}
+        return _EMPTY_ATTRS
 
     @property
     def external_sensor(self) -> str:
@@ -208,20 +231,39 @@ class PlantCurrentStatus(RestoreSensor):
         _LOGGER.info("Setting %s external sensor to %s", self.entity_id, new_sensor)
         # pylint: disable=attribute-defined-outside-init
         self._external_sensor = new_sensor
-        self.async_track_entity(self.entity_id)
-        self.async_track_entity(self.external_sensor)
+        self.async_track_entities()
 
+        self.async_write_ha_state_soon()
+
+    @callback
+    def async_write_ha_state_soon(self) -> None:
+        """Write the state on the next loop iteration, coalescing repeated calls"""
+        if self._write_scheduled:
+            return
+        self._write_scheduled = True
+        self._hass.loop.call_soon(self._async_write_scheduled_state)
+
+    @callback
+    def _async_write_scheduled_state(self) -> None:
+        self._write_scheduled = False
         self.async_write_ha_state()
 
-    def async_track_entity(self, entity_id: str) -> None:
-        """Track state_changed of certain entities"""
-        if entity_id and entity_id not in self._tracker:
-            async_track_state_change_event(
-                self._hass,
-                list([entity_id]),
-                self._state_changed_event,
-            )
-            self._tracker.append(entity_id)
+    def async_track_entities(self) -> None:
+        """Track state_changed of ourself and the external sensor"""
+        tracker = [self.entity_id]
+        if self.external_sensor:
+            tracker.append(self.external_sensor)
+        if tracker == self._tracker:
+            return
+        # Drop the listener for the previous sensor before adding a new one
+        if self._unsub_tracker:
+            self._unsub_tracker()
+        self._unsub_tracker = async_track_state_change_event(
+            self._hass,
+            tracker,
+            self._state_changed_event,
+        )
+        self._tracker = tracker
 
     async def async_added_to_hass(self) -> None:
         """Handle entity which will be added."""
@@ -233,29 +275,38 @@ class PlantCurrentStatus(RestoreSensor):
         self._attr_native_value = None
         if state:
             if "external_sensor" in state.attributes:
-                self.replace_external_sensor(state.attributes["external_sensor"])
-        self.async_track_entity(self.entity_id)
-        if self.external_sensor:
-            self.async_track_entity(self.external_sensor)
-
-        async_dispatcher_connect(
-            self._hass, DATA_UPDATED, self._schedule_immediate_update
+                self._external_sensor = state.attributes["external_sensor"]
+        # Register the state tracker once, it is replaced if the sensor changes
+        self.async_track_entities()
+        self.async_on_remove(self.async_untrack_entities)
+
+        # Only listen for updates of our own plant
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self._hass,
+                f"{DATA_UPDATED}_{self._plant.unique_id}",
+                self._schedule_immediate_update,
+            )
         )
 
+    @callback
+    def async_untrack_entities(self) -> None:
+        """Stop tracking state changes"""
+        if self._unsub_tracker:
+            self._unsub_tracker()
+            self._unsub_tracker = None
+        self._tracker = []
+
     async def async_update(self) -> None:
         """Set state and unit to the parent sensor state and unit"""
         if self.external_sensor:
+            external_state = self._hass.states.get(self.external_sensor)
             try:
-                self._attr_native_value = float(
-                    self._hass.states.get(self.external_sensor).state
-                )
-                if (
-                    ATTR_UNIT_OF_MEASUREMENT
-                    in self._hass.states.get(self.external_sensor).attributes
-                ):
-                    self._attr_native_unit_of_measurement = self._hass.states.get(
-                        self.external_sensor
-                    ).attributes[ATTR_UNIT_OF_MEASUREMENT]
+                self._attr_native_value = _parse_float(external_state.state)
+                if ATTR_UNIT_OF_MEASUREMENT in external_state.attributes:
+                    self._attr_native_unit_of_measurement = external_state.attributes[
+                        ATTR_UNIT_OF_MEASUREMENT
+                    ]
             except AttributeError:
                 _LOGGER.debug(
                     "Unknown external sensor for %s: %s, setting to default: %s",
@@ -269,7 +320,7 @@ class PlantCurrentStatus(RestoreSensor):
                     "Unknown external value for %s: %s = %s, setting to default: %s",
                     self.entity_id,
                     self.external_sensor,
-                    self._hass.states.get(self.external_sensor).state,
+                    external_state.state,
                     self._default_state,
                 )
                 self._attr_native_value = self._default_state
@@ -294,10 +345,11 @@ class PlantCurrentStatus(RestoreSensor):
     @callback
     def state_changed(self, entity_id, new_state):
         """Run on every update to allow for changes from the GUI and service call"""
-        if not self.hass.states.get(self.entity_id):
+        state_obj = self.hass.states.get(self.entity_id)
+        if state_obj is None:
             return
         if entity_id == self.entity_id:
-            current_attrs = self.hass.states.get(self.entity_id).attributes
+            current_attrs = state_obj.attributes
             if current_attrs.get("external_sensor") != self.external_sensor:
                 self.replace_external_sensor(current_attrs.get("external_sensor"))
 
@@ -313,11 +365,17 @@ class PlantCurrentStatus(RestoreSensor):
             and new_state.state != STATE_UNKNOWN
             and new_state.state != STATE_UNAVAILABLE
         ):
+            unit = new_state.attributes.get(
+                ATTR_UNIT_OF_MEASUREMENT, self._attr_native_unit_of_measurement
+            )
+            # Leave the cached properties alone if nothing changed
+            if (
+                new_state.state == self._attr_native_value
+                and unit == self._attr_native_unit_of_measurement
+            ):
+                return
             self._attr_native_value = new_state.state
-            if ATTR_UNIT_OF_MEASUREMENT in new_state.attributes:
-                self._attr_native_unit_of_measurement = new_state.attributes[
-                    ATTR_UNIT_OF_MEASUREMENT
-                ]
+            self._attr_native_unit_of_measurement = unit
         else:
             self._attr_native_value = self._default_state
 
@@ -329,10 +387,9 @@ class PlantCurrentIlluminance(PlantCurrentStatus):
         self, hass: HomeAssistant, config: ConfigEntry, plantdevice: Entity
     ) -> None:
         """Initialize the sensor"""
-        self._attr_name = (
-            f"{config.data[FLOW_PLANT_INFO][ATTR_NAME]} {READING_ILLUMINANCE}"
+        self._attr_name, self._attr_unique_id = _build_names(
+            config, READING_ILLUMINANCE, "current-illuminance"
         )
-        self._attr_unique_id = f"{config.entry_id}-current-illuminance"
         self._attr_icon = ICON_ILLUMINANCE
         self._external_sensor = config.data[FLOW_PLANT_INFO].get(
             FLOW_SENSOR_ILLUMINANCE
@@ -353,10 +410,9 @@ class PlantCurrentConductivity(PlantCurrentStatus):
         self, hass: HomeAssistant, config: ConfigEntry, plantdevice: Entity
     ) -> None:
         """Initialize the sensor"""
-        self._attr_name = (
-            f"{config.data[FLOW_PLANT_INFO][ATTR_NAME]} {READING_CONDUCTIVITY}"
+        self._attr_name, self._attr_unique_id = _build_names(
+            config, READING_CONDUCTIVITY, "current-conductivity"
         )
-        self._attr_unique_id = f"{config.entry_id}-current-conductivity"
         self._attr_icon = ICON_CONDUCTIVITY
         self._external_sensor = config.data[FLOW_PLANT_INFO].get(
             FLOW_SENSOR_CONDUCTIVITY
@@ -378,10 +434,9 @@ class PlantCurrentMoisture(PlantCurrentStatus):
         self, hass: HomeAssistant, config: ConfigEntry, plantdevice: Entity
     ) -> None:
         """Initialize the sensor"""
-        self._attr_name = (
-            f"{config.data[FLOW_PLANT_INFO][ATTR_NAME]} {READING_MOISTURE}"
+        self._attr_name, self._attr_unique_id = _build_names(
+            config, READING_MOISTURE, "current-moisture"
         )
-        self._attr_unique_id = f"{config.entry_id}-current-moisture"
         self._external_sensor = config.data[FLOW_PLANT_INFO].get(FLOW_SENSOR_MOISTURE)
         self._attr_icon = ICON_MOISTURE
         self._attr_native_unit_of_measurement = PERCENTAGE
@@ -401,10 +456,9 @@ class PlantCurrentTemperature(PlantCurrentStatus):
         self, hass: HomeAssistant, config: ConfigEntry, plantdevice: Entity
     ) -> None:
         """Initialize the sensor"""
-        self._attr_name = (
-            f"{config.data[FLOW_PLANT_INFO][ATTR_NAME]} {READING_TEMPERATURE}"
+        self._attr_name, self._attr_unique_id = _build_names(
+            config, READING_TEMPERATURE, "current-temperature"
         )
-        self._attr_unique_id = f"{config.entry_id}-current-temperature"
         self._external_sensor = config.data[FLOW_PLANT_INFO].get(
             FLOW_SENSOR_TEMPERATURE
         )
@@ -425,10 +479,9 @@ class PlantCurrentHumidity(PlantCurrentStatus):
         self, hass: HomeAssistant, config: ConfigEntry, plantdevice: Entity
     ) -> None:
         """Initialize the sensor"""
-        self._attr_name = (
-            f"{config.data[FLOW_PLANT_INFO][ATTR_NAME]} {READING_HUMIDITY}"
+        self._attr_name, self._attr_unique_id = _build_names(
+            config, READING_HUMIDITY, "current-humidity"
         )
-        self._attr_unique_id = f"{config.entry_id}-current-humidity"
         self._external_sensor = config.data[FLOW_PLANT_INFO].get(FLOW_SENSOR_HUMIDITY)
         self._attr_icon = ICON_HUMIDITY
         self._attr_native_unit_of_measurement = PERCENTAGE
@@ -447,9 +500,9 @@ class PlantCurrentPpfd(PlantCurrentStatus):
         self, hass: HomeAssistant, config: ConfigEntry, plantdevice: Entity
     ) -> None:
         """Initialize the sensor"""
-        self._attr_name = f"{config.data[FLOW_PLANT_INFO][ATTR_NAME]} {READING_PPFD}"
-
-        self._attr_unique_id = f"{config.entry_id}-current-ppfd"
+        self._attr_name, self._attr_unique_id = _build_names(
+            config, READING_PPFD, "current-ppfd"
+        )
         self._attr_unit_of_measurement = UNIT_PPFD
         self._attr_native_unit_of_measurement = UNIT_PPFD
 
@@ -460,7 +513,7 @@ class PlantCurrentPpfd(PlantCurrentStatus):
         super().__init__(hass, config, plantdevice)
         self._follow_unit = False
         self.entity_id = async_generate_entity_id(
-            f"{DOMAIN_SENSOR}.{{}}", self.name, current_ids={}
+            f"{DOMAIN_SENSOR}.{{}}", self._attr_name, current_ids={}
         )
 
     @property
@@ -485,12 +538,7 @@ class PlantCurrentPpfd(PlantCurrentStatus):
         https://www.apogeeinstruments.com/conversion-ppfd-to-lux/
         μmol/m²/s
         """
-        if value is not None and value != STATE_UNAVAILABLE and value != STATE_UNKNOWN:
-            value = float(value) * DEFAULT_LUX_TO_PPFD / 1000000
-        else:
-            value = None
-
-        return value
+        return None if value in _BAD_STATES else _parse_float(value) * _PPFD_SCALE
 
     async def async_update(self) -> None:
         """Run on every update to allow for changes from the GUI and service call"""
@@ -514,14 +562,15 @@ class PlantCurrentPpfd(PlantCurrentStatus):
             return
         if self._external_sensor != self._plant.sensor_illuminance.entity_id:
             self.replace_external_sensor(self._plant.sensor_illuminance.entity_id)
+        value = None
         if self.external_sensor:
             external_sensor = self.hass.states.get(self.external_sensor)
             if external_sensor:
-                self._attr_native_value = self.ppfd(external_sensor.state)
-            else:
-                self._attr_native_value = None
-        else:
-            self._attr_native_value = None
+                value = self.ppfd(external_sensor.state)
+        # Leave the cached properties alone if nothing changed
+        if value == self._attr_native_value:
+            return
+        self._attr_native_value = value
 
 
 class PlantTotalLightIntegral(IntegrationSensor):
@@ -536,7 +585,7 @@ class PlantTotalLightIntegral(IntegrationSensor):
     ) -> None:
         """Initialize the sensor"""
         super().__init__(
-            integration_method=METHOD_TRAPEZOIDAL,
+            integration_method=METHOD_LEFT,
             name=f"{config.data[FLOW_PLANT_INFO][ATTR_NAME]} Total {READING_PPFD} Integral",
             round_digits=2,
             source_entity=illuminance_ppfd_sensor.entity_id,
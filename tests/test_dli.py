@@ -1,10 +1,15 @@
 """Tests for the Daily Light Integral functionality."""
-from datetime import datetime, timedelta
+from datetime import timedelta
+from types import SimpleNamespace
 import unittest
 from unittest.mock import MagicMock, patch
 
 from homeassistant.const import STATE_UNKNOWN, STATE_UNAVAILABLE
-from custom_components.plant.plant_meters import PlantDailyLightIntegral
+from homeassistant.util import dt as dt_util
+from custom_components.plant.plant_meters import (
+    _DLI_WINDOW_SLOTS,
+    PlantDailyLightIntegral,
+)
 
 
 class TestDailyLightIntegral(unittest.TestCase):
@@ -20,122 +25,259 @@ class TestDailyLightIntegral(unittest.TestCase):
         self.illuminance_sensor.entity_id = "sensor.test_ppfd_integral"
         self.plant_device = MagicMock()
         self.plant_device.unique_id = "test_plant_unique_id"
-        
+
         # Create the DLI sensor
         self.dli = PlantDailyLightIntegral(
             self.hass, self.config, self.illuminance_sensor, self.plant_device
         )
-        
+
         # Mock the async_write_ha_state method
         self.dli.async_write_ha_state = MagicMock()
 
     def test_initialization(self):
         """Test that the sensor initializes with correct values."""
         self.assertEqual(self.dli._attr_native_value, 0)
-        self.assertEqual(self.dli._data_points, [])
+        self.assertEqual(len(self.dli._buckets), _DLI_WINDOW_SLOTS)
+        self.assertEqual(sum(self.dli._buckets), 0)
+        self.assertEqual(self.dli._bucket_total, 0)
+        self.assertIsNone(self.dli._last_slot)
         self.assertEqual(self.dli._source_entity, "sensor.test_ppfd_integral")
 
     def test_source_changed_valid_increment(self):
         """Test that source changes with valid increments are recorded."""
         # Create a mock event with new state = 10, old state = 5
-        event = MagicMock()
+        event = SimpleNamespace()
+        event.time_fired_timestamp = dt_util.utcnow().timestamp()
         event.data = {
-            "new_state": MagicMock(state="10"),
-            "old_state": MagicMock(state="5")
+            "new_state": SimpleNamespace(state="10"),
+            "old_state": SimpleNamespace(state="5")
         }
-        
-        # Call the source changed method
+
+        # Call the source changed method and let the debouncer pass it on
         self.dli._source_changed(event)
-        
-        # Check that a data point was added
-        self.assertEqual(len(self.dli._data_points), 1)
-        self.assertEqual(self.dli._data_points[0][1], 5)  # Increment value
+        self.dli._flush_increment()
+
+        # Check that the increment was added to the current bucket
+        idx = self.dli._last_slot % _DLI_WINDOW_SLOTS
+        self.assertEqual(self.dli._buckets[idx], 5)  # Increment value
+        self.assertEqual(self.dli._bucket_total, 5)
         self.assertEqual(self.dli._attr_native_value, 5)
-        
+
         # Add another increment
         event.data = {
-            "new_state": MagicMock(state="15"),
-            "old_state": MagicMock(state="10")
+            "new_state": SimpleNamespace(state="15"),
+            "old_state": SimpleNamespace(state="10")
         }
         self.dli._source_changed(event)
-        
-        # Check that another data point was added and value updated
-        self.assertEqual(len(self.dli._data_points), 2)
+        self.dli._flush_increment()
+
+        # Check that the bucket and value were updated
+        self.assertEqual(self.dli._buckets[idx], 10)
         self.assertEqual(self.dli._attr_native_value, 10)  # 5 + 5
 
     def test_source_changed_invalid_states(self):
         """Test handling of invalid states."""
         # Test with unknown state
-        event = MagicMock()
+        event = SimpleNamespace()
         event.data = {
-            "new_state": MagicMock(state=STATE_UNKNOWN),
-            "old_state": MagicMock(state="5")
+            "new_state": SimpleNamespace(state=STATE_UNKNOWN),
+            "old_state": SimpleNamespace(state="5")
         }
         self.dli._source_changed(event)
-        self.assertEqual(len(self.dli._data_points), 0)
-        
+        self.assertEqual(self.dli._bucket_total, 0)
+
         # Test with unavailable state
         event.data = {
-            "new_state": MagicMock(state=STATE_UNAVAILABLE),
-            "old_state": MagicMock(state="5")
+            "new_state": SimpleNamespace(state=STATE_UNAVAILABLE),
+            "old_state": SimpleNamespace(state="5")
         }
         self.dli._source_changed(event)
-        self.assertEqual(len(self.dli._data_points), 0)
-        
+        self.assertEqual(self.dli._bucket_total, 0)
+
         # Test with non-numeric state
         event.data = {
-            "new_state": MagicMock(state="not_a_number"),
-            "old_state": MagicMock(state="5")
+            "new_state": SimpleNamespace(state="not_a_number"),
+            "old_state": SimpleNamespace(state="5")
         }
         self.dli._source_changed(event)
-        self.assertEqual(len(self.dli._data_points), 0)
+        self.assertEqual(self.dli._bucket_total, 0)
+        self.assertEqual(sum(self.dli._buckets), 0)
 
     def test_update_sliding_window(self):
-        """Test that old data points are removed from the sliding window."""
-        # Add some data points with timestamps
-        now = datetime.now()
+        """Test that old increments are removed from the sliding window."""
+        # Add some increments at different times
+        now = dt_util.utcnow()
         old_time = now - timedelta(hours=25)  # Older than 24 hours
         recent_time = now - timedelta(hours=12)  # Within 24 hours
-        
-        self.dli._data_points = [
-            (old_time, 5),      # Should be removed
-            (recent_time, 10),  # Should be kept
-            (now, 15)           # Should be kept
-        ]
-        
-        # Update the sliding window
-        with patch('custom_components.plant.plant_meters.datetime') as mock_datetime:
-            mock_datetime.now.return_value = now
-            self.dli._update_sliding_window()
-        
-        # Check that old data point was removed
-        self.assertEqual(len(self.dli._data_points), 2)
-        self.assertEqual(self.dli._data_points[0][1], 10)
-        self.assertEqual(self.dli._data_points[1][1], 15)
+
+        for when, new, old in (
+            (old_time, "5", "0"),  # Should be removed
+            (recent_time, "15", "5"),  # Should be kept
+            (now, "30", "15"),  # Should be kept
+        ):
+            event = SimpleNamespace()
+            event.time_fired_timestamp = when.timestamp()
+            event.data = {
+                "new_state": SimpleNamespace(state=new),
+                "old_state": SimpleNamespace(state=old),
+            }
+            with patch(
+                "custom_components.plant.plant_meters.dt_util.utcnow",
+                return_value=when,
+            ):
+                self.dli._source_changed(event)
+                self.dli._flush_increment()
+
+        # Adding the recent increment already emptied the expired bucket
         self.assertEqual(self.dli._attr_native_value, 25)  # 10 + 15
 
+        # Half a day later only the latest increment is left
+        later = now + timedelta(hours=13)
+        with patch(
+            "custom_components.plant.plant_meters.dt_util.utcnow", return_value=later
+        ):
+            self.dli._update_sliding_window()
+        self.assertEqual(self.dli._attr_native_value, 15)
+
+        # And after a full day the window is empty
+        later = now + timedelta(hours=24)
+        with patch(
+            "custom_components.plant.plant_meters.dt_util.utcnow", return_value=later
+        ):
+            self.dli._update_sliding_window()
+        self.assertEqual(self.dli._attr_native_value, 0)
+        self.assertEqual(sum(self.dli._buckets), 0)
+
     def test_empty_data_points(self):
-        """Test behavior with empty data points."""
-        self.dli._data_points = []
+        """Test behavior with empty buckets."""
         self.dli._update_value()
         self.assertEqual(self.dli._attr_native_value, 0)
 
     def test_negative_increments_ignored(self):
         """Test that negative increments are ignored."""
-        event = MagicMock()
+        event = SimpleNamespace()
         event.data = {
-            "new_state": MagicMock(state="5"),
-            "old_state": MagicMock(state="10")  # Decreasing value
+            "new_state": SimpleNamespace(state="5"),
+            "old_state": SimpleNamespace(state="10")  # Decreasing value
         }
-        
+
         self.dli._source_changed(event)
-        self.assertEqual(len(self.dli._data_points), 0)  # No data point added
+        self.assertEqual(self.dli._bucket_total, 0)  # No increment added
 
     def test_rounding(self):
         """Test that values are properly rounded."""
-        self.dli._data_points = [
-            (datetime.now(), 5.123),
-            (datetime.now(), 10.456)
-        ]
+        self.dli._buckets[0] = 5.123
+        self.dli._buckets[1] = 10.456
+        self.dli._bucket_total = 5.123 + 10.456
         self.dli._update_value()
         self.assertEqual(self.dli._attr_native_value, 15.58)  # 5.123 + 10.456 = 15.579 rounded to 15.58
+
+    def test_expiry_timer(self):
+        """Test that a timer is armed for when the oldest bucket expires."""
+        now = dt_util.utcnow()
+        event = SimpleNamespace()
+        event.time_fired_timestamp = now.timestamp()
+        event.data = {
+            "new_state": SimpleNamespace(state="10"),
+            "old_state": SimpleNamespace(state="5")
+        }
+        unsub = MagicMock()
+        with patch(
+            "custom_components.plant.plant_meters.async_track_point_in_utc_time",
+            return_value=unsub,
+        ) as mock_track:
+            self.dli._source_changed(event)
+            self.dli._flush_increment()
+            # Only one timer is armed while it is pending
+            self.dli._source_changed(event)
+            self.dli._flush_increment()
+
+        mock_track.assert_called_once()
+        expires = mock_track.call_args.args[2]
+        self.assertGreater(expires, now + timedelta(hours=23, minutes=55))
+        self.assertLessEqual(expires, now + timedelta(hours=24))
+
+        # Once the window is empty no new timer is armed
+        with patch(
+            "custom_components.plant.plant_meters.dt_util.utcnow", return_value=expires
+        ), patch(
+            "custom_components.plant.plant_meters.async_track_point_in_utc_time"
+        ) as mock_track:
+            self.dli._update_sliding_window(expires)
+        mock_track.assert_not_called()
+        self.assertIsNone(self.dli._unsub_expiry)
+        self.assertEqual(self.dli._attr_native_value, 0)
+
+        # Removing the entity cancels a pending timer
+        self.dli._unsub_expiry = unsub
+        self.dli._cancel_expiry()
+        unsub.assert_called_once()
+        self.assertIsNone(self.dli._unsub_expiry)
+
+    def test_write_throttle(self):
+        """Test that bursts of updates are written once per interval."""
+        with patch(
+            "custom_components.plant.plant_meters.async_call_later"
+        ) as mock_later:
+            self.dli._bucket_total = 1
+            self.dli._update_value()
+            self.dli._bucket_total = 2
+            self.dli._update_value()
+            self.dli._bucket_total = 3
+            self.dli._update_value()
+
+            # Only the first update is written straight away
+            self.assertEqual(self.dli.async_write_ha_state.call_count, 1)
+            mock_later.assert_called_once()
+            self.assertEqual(self.dli._attr_native_value, 3)
+
+            # The latest value is written when the interval has passed
+            self.dli._flush_write()
+            self.assertEqual(self.dli.async_write_ha_state.call_count, 2)
+
+            # Nothing to write after a quiet interval
+            self.dli._flush_write()
+            self.assertEqual(self.dli.async_write_ha_state.call_count, 2)
+            self.assertIsNone(self.dli._unsub_write)
+
+    def test_debounce(self):
+        """Test that source changes are collected before they are added."""
+        event = SimpleNamespace()
+        event.time_fired_timestamp = dt_util.utcnow().timestamp()
+        unsub = MagicMock()
+        with patch(
+            "custom_components.plant.plant_meters.async_call_later",
+            return_value=unsub,
+        ) as mock_later:
+            for new, old in (("6", "5"), ("8", "6")):
+                event.data = {
+                    "new_state": SimpleNamespace(state=new),
+                    "old_state": SimpleNamespace(state=old),
+                }
+                self.dli._source_changed(event)
+
+            # Nothing is added yet, but a timer is waiting
+            self.assertEqual(self.dli._bucket_total, 0)
+            self.assertEqual(self.dli._pending_increment, 3)
+            mock_later.assert_called_once()
+
+            # The third change flushes straight away and cancels the timer
+            event.data = {
+                "new_state": SimpleNamespace(state="9"),
+                "old_state": SimpleNamespace(state="8"),
+            }
+            self.dli._source_changed(event)
+            unsub.assert_called_once()
+            self.assertEqual(self.dli._bucket_total, 4)
+            self.assertEqual(self.dli._pending_increment, 0)
+
+            # A single change is added when the timer fires
+            event.data = {
+                "new_state": SimpleNamespace(state="11"),
+                "old_state": SimpleNamespace(state="9"),
+            }
+            self.dli._source_changed(event)
+            self.assertEqual(self.dli._bucket_total, 4)
+            self.dli._flush_increment()
+            self.assertEqual(self.dli._bucket_total, 6)
+            self.assertEqual(self.dli._attr_native_value, 6)